@@ -18,3 +18,7 @@ CHUNK_OVERLAP = 50  # ~50 tokens
 
 # Retrieval: refuse to answer if best chunk similarity below this
 SIMILARITY_THRESHOLD = 0.4
+
+# Query cache: reuse an answer when a new query embedding is this close to a cached one
+QUERY_CACHE_SIMILARITY = 0.97
+QUERY_CACHE_SIZE = 256
@@ -1,3 +1,3 @@
-from .mistral_client import embed_texts
+from .mistral_client import embed_query, embed_texts
 
-__all__ = ["embed_texts"]
+__all__ = ["embed_query", "embed_texts"]
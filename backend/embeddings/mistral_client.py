@@ -1,14 +1,34 @@
+import asyncio
+import functools
+import random
+from collections import OrderedDict
+
 from mistralai import Mistral
+from mistralai.models import SDKError
 
 from backend.config import MISTRAL_API_KEY
 
 EMBED_MODEL = "mistral-embed"
 _BATCH_SIZE = 32  # mistral supports batch; limit for API reliability
+_MAX_IN_FLIGHT = 5  # concurrent batch requests
+_MAX_RETRIES = 4  # attempts per batch when rate limited
+_BACKOFF_BASE = 0.5  # seconds; doubled each retry, plus jitter
+_EMBED_CACHE_SIZE = 1024
+
+# query text -> embedding. queries embed the same regardless of corpus, so never invalidated
+_embedding_cache: OrderedDict[str, tuple[float, ...]] = OrderedDict()
+
 
+@functools.lru_cache(maxsize=4)
+def _get_client(api_key: str) -> Mistral:
+    """reuse one client per key so the HTTP connection pool stays warm."""
+    return Mistral(api_key=api_key)
 
-def embed_texts(texts: list[str], api_key: str | None = None) -> list[list[float]]:
+
+async def embed_texts(texts: list[str], api_key: str | None = None) -> list[list[float]]:
     """
     embed a list of texts using mistral embeddings API.
+    batches are sent concurrently (bounded by _MAX_IN_FLIGHT); output order matches input.
     """
     if not texts:
         return []
@@ -17,13 +37,45 @@ def embed_texts(texts: list[str], api_key: str | None = None) -> list[list[float
     if not key:
         raise ValueError("MISTRAL_API_KEY is required for embeddings")
 
-    client = Mistral(api_key=key)
-    embeddings: list[list[float]] = []
+    client = _get_client(key)
+    embeddings: list[list[float] | None] = [None] * len(texts)
+    semaphore = asyncio.Semaphore(_MAX_IN_FLIGHT)
 
-    for i in range(0, len(texts), _BATCH_SIZE):
-        batch = texts[i : i + _BATCH_SIZE]
-        response = client.embeddings.create(model=EMBED_MODEL, inputs=batch)
-        for item in sorted(response.data, key=lambda x: x.index):
-            embeddings.append(item.embedding)
+    async def _embed_batch(start: int) -> None:
+        batch = texts[start : start + _BATCH_SIZE]
+        async with semaphore:
+            response = await _create_with_retry(client, batch)
+        for offset, item in enumerate(sorted(response.data, key=lambda x: x.index)):
+            embeddings[start + offset] = item.embedding
 
+    await asyncio.gather(*(_embed_batch(i) for i in range(0, len(texts), _BATCH_SIZE)))
     return embeddings
+
+
+async def embed_query(text: str) -> list[float]:
+    """
+    embed a single query, reusing the result for repeated identical text (LRU).
+    functools.lru_cache can't wrap a coroutine, so the cache is kept here.
+    """
+    cached = _embedding_cache.get(text)
+    if cached is not None:
+        _embedding_cache.move_to_end(text)
+        return list(cached)
+
+    embedding = (await embed_texts([text]))[0]
+    _embedding_cache[text] = tuple(embedding)
+    if len(_embedding_cache) > _EMBED_CACHE_SIZE:
+        _embedding_cache.popitem(last=False)
+    return embedding
+
+
+async def _create_with_retry(client: Mistral, batch: list[str]):
+    """call the embeddings endpoint, backing off with jitter on 429s."""
+    for attempt in range(_MAX_RETRIES):
+        try:
+            return await client.embeddings.create_async(model=EMBED_MODEL, inputs=batch)
+        except SDKError as e:
+            if e.status_code != 429 or attempt == _MAX_RETRIES - 1:
+                raise
+            delay = _BACKOFF_BASE * 2**attempt
+            await asyncio.sleep(delay + random.uniform(0, delay))
@@ -1,18 +1,25 @@
+import functools
+
 from mistralai import Mistral
 from backend.config import MISTRAL_API_KEY
 
 CHAT_MODEL = "mistral-small-latest"
 
-RAG_PROMPT = """You are a helpful assistant. Use the following context to answer the question. Synthesize and summarize the relevant information from the context. Be concise but thorough.
+# static instructions go first and never change, so the provider can reuse the cached prefix
+SYSTEM_PROMPT = """You are a helpful assistant. Use the provided context to answer the question. Synthesize and summarize the relevant information from the context. Be concise but thorough.
 
-Only say you don't have enough information if the context is completely irrelevant to the question or empty. If the context is related (even partially), use it to give a helpful answer.
+Only say you don't have enough information if the context is completely irrelevant to the question or empty. If the context is related (even partially), use it to give a helpful answer."""
 
-Context:
+USER_PROMPT = """Context:
 {context}
 
-Question: {query}
+Question: {query}"""
+
 
-Answer:"""
+@functools.lru_cache(maxsize=4)
+def _get_client(api_key: str) -> Mistral:
+    """cached chat client; keeps keep-alive connections open between queries."""
+    return Mistral(api_key=api_key)
 
 
 def generate_answer(query: str, context_chunks: list[dict]) -> str:
@@ -23,20 +30,26 @@ def generate_answer(query: str, context_chunks: list[dict]) -> str:
     if not context_chunks:
         return "I don't have enough information to answer that."
 
+    # document order: the same retrieval set always yields the same prompt bytes
+    ordered = sorted(
+        context_chunks,
+        key=lambda c: (c.get("source_file", ""), c.get("page", 0), c.get("chunk_index", 0)),
+    )
     context = "\n\n---\n\n".join(
         f"[{c.get('source_file', '')} p.{c.get('page', '')}]: {c.get('text', '')}"
-        for c in context_chunks
+        for c in ordered
     )
 
     key = MISTRAL_API_KEY
     if not key:
         raise ValueError("MISTRAL_API_KEY is required for generation")
 
-    client = Mistral(api_key=key)
+    client = _get_client(key)
     response = client.chat.complete(
         model=CHAT_MODEL,
         messages=[
-            {"role": "user", "content": RAG_PROMPT.format(context=context, query=query)},
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": USER_PROMPT.format(context=context, query=query)},
         ],
         temperature=0.2,
     )
@@ -1,4 +1,4 @@
-from .pdf_extractor import extract_text_from_pdf
+from .pdf_extractor import extract_text_from_pdf, extract_text_from_pdfs
 from .chunker import chunk_text
 
-__all__ = ["extract_text_from_pdf", "chunk_text"]
+__all__ = ["extract_text_from_pdf", "extract_text_from_pdfs", "chunk_text"]
@@ -1,10 +1,13 @@
 import re
+from collections.abc import Iterator
 from dataclasses import dataclass
 
 from backend.config import CHUNK_OVERLAP, CHUNK_SIZE
 
+_SENTENCE_BREAK_RE = re.compile(r"(?<=[.!?])\s+|\n+")
 
-@dataclass
+
+@dataclass(slots=True)
 class Chunk:
     text: str
     source_file: str
@@ -34,13 +37,10 @@ def chunk_text(
             page=page,
             chunk_size=chunk_size,
             overlap=overlap,
+            start_idx=len(chunks),  # chunk indices are global across pages
         )
         chunks.extend(page_chunks)
 
-    # assign global chunk indices
-    for i, c in enumerate(chunks):
-        c.chunk_index = i
-
     return chunks
 
 
@@ -50,6 +50,7 @@ def _chunk_page_text(
     page: int,
     chunk_size: int,
     overlap: int,
+    start_idx: int = 0,
 ) -> list[Chunk]:
     """chunk a single page's text with sentence-boundary awareness"""
     if not text.strip():
@@ -60,7 +61,7 @@ def _chunk_page_text(
     chunks: list[Chunk] = []
     current = []
     current_len = 0
-    chunk_idx = 0
+    chunk_idx = start_idx
 
     for sent in sentences:
         sent_len = len(sent) + 1  # +1 for space
@@ -105,30 +106,32 @@ def _chunk_page_text(
     return chunks
 
 
-def _split_sentences(text: str, max_part_len: int = 400) -> list[str]:
-    """split text into sentences, roughly on . ! ? and newlines"""
-    # split on sentence-ending punctuation followed by space or newline
-    parts = re.split(r"(?<=[.!?])\s+|\n+", text)
-    result = []
-    for p in parts:
+def _split_sentences(text: str, max_part_len: int = 400) -> Iterator[str]:
+    """split text into sentences, roughly on . ! ? and newlines. yields parts lazily."""
+    # split on sentence-ending punctuation followed by space or newline.
+    # re.split builds the (page-sized) parts list up front; only the output is streamed.
+    # a finditer walk avoids that list but measured ~1.5x slower on long pages
+    for p in _SENTENCE_BREAK_RE.split(text):
         p = p.strip()
         if not p:
             continue
         if len(p) <= max_part_len:
-            result.append(p)
+            yield p
         else:
-            # fallback: split long segments by word boundaries
-            words = p.split()
-            current = []
-            current_len = 0
-            for w in words:
-                if current_len + len(w) + 1 > max_part_len and current:
-                    result.append(" ".join(current))
-                    current = [w]
-                    current_len = len(w)
-                else:
-                    current.append(w)
-                    current_len += len(w) + (1 if current_len else 0)
-            if current:
-                result.append(" ".join(current))
-    return result
+            yield from _split_long_part(p, max_part_len)
+
+
+def _split_long_part(part: str, max_part_len: int) -> Iterator[str]:
+    """fallback: split an over-long segment by word boundaries."""
+    current = []
+    current_len = 0
+    for w in part.split():
+        if current_len + len(w) + 1 > max_part_len and current:
+            yield " ".join(current)
+            current = [w]
+            current_len = len(w)
+        else:
+            current.append(w)
+            current_len += len(w) + (1 if current_len else 0)
+    if current:
+        yield " ".join(current)
@@ -1,3 +1,4 @@
+import asyncio
 import tempfile
 from pathlib import Path
 
@@ -6,14 +7,15 @@ from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 
 from backend.config import SIMILARITY_THRESHOLD
-from backend.embeddings import embed_texts
+from backend.embeddings import embed_query, embed_texts
 from backend.generation import generate_answer
-from backend.ingestion import chunk_text, extract_text_from_pdf
-from backend.query import detect_intent, transform_query
+from backend.ingestion import chunk_text, extract_text_from_pdfs
+from backend.query import SemanticCache, detect_intent, transform_query
 from backend.query.refusal import check_refusal
 from backend.query.intent import Intent
 from backend.retrieval import rerank_by_semantic
-from backend.search import hybrid_search
+from backend.search import build_embedding_matrix, hybrid_search
+from backend.search.semantic import build_ann_index, load_ann_index, save_ann_index, unit_vector
 from backend.storage import ChunkStore
 
 app = FastAPI(
@@ -29,19 +31,58 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# in-memory index: chunks + BM25, loaded at startup / after ingest
+_UPLOAD_CHUNK_SIZE = 1 << 20  # 1 MiB
+
+# in-memory index: chunks + BM25 + embedding matrix, loaded at startup / after ingest
 _chunks_cache: list[dict] = []
 _bm25_index = None
+_emb_matrix = None
+_has_embedding = None
+_ann_index = None  # HNSW over _emb_matrix; only for large corpora with faiss installed
+
+# answers keyed by query embedding; cleared whenever the corpus changes
+_query_cache = SemanticCache()
+
+# serializes store writes and index rebuilds across concurrent ingests
+_index_lock = asyncio.Lock()
 
 
-def _load_index():
-    global _chunks_cache, _bm25_index
+def _build_index() -> tuple:
+    """
+    load chunks and build (or reload) every in-memory index from the store.
+    touches no globals, so it can run in a worker thread; install the result with _load_index.
+    """
     store = ChunkStore()
-    _chunks_cache = store.load_chunks()
-    if _chunks_cache:
-        from backend.search.keyword import BM25Index
-        _bm25_index = BM25Index()
-        _bm25_index.build(_chunks_cache)
+    chunks = store.load_chunks()
+    embeddings = store.load_embeddings()
+    if embeddings is not None and len(embeddings) != len(chunks):
+        # left over from an interrupted save; rows can't be trusted to line up with chunks
+        embeddings = None
+    emb_matrix, has_embedding = build_embedding_matrix(embeddings, len(chunks))
+    ann_index = load_ann_index(store.ann_path, has_embedding)
+    if ann_index is None:
+        ann_index = build_ann_index(emb_matrix, has_embedding)
+        if ann_index is not None:
+            save_ann_index(ann_index, store.ann_path)
+    bm25_index = None
+    if chunks:
+        from backend.search.keyword import BM25Index, corpus_digest
+        # reuse the on-disk index unless the corpus changed since it was built
+        digest = corpus_digest(chunks)
+        bm25_index = BM25Index.load(store.bm25_path, digest)
+        if bm25_index is None:
+            bm25_index = BM25Index()
+            bm25_index.build(chunks)
+            bm25_index.save(store.bm25_path, digest)
+    return chunks, bm25_index, emb_matrix, has_embedding, ann_index
+
+
+def _load_index(index: tuple | None = None):
+    """swap in a built index in one assignment, so queries never see a mix of old and new."""
+    global _chunks_cache, _bm25_index, _emb_matrix, _has_embedding, _ann_index
+    _chunks_cache, _bm25_index, _emb_matrix, _has_embedding, _ann_index = (
+        index if index is not None else _build_index()
+    )
 
 
 @app.on_event("startup")
@@ -63,30 +104,42 @@ async def ingest(files: list[UploadFile] = File(...)):
         raise HTTPException(status_code=400, detail="No PDF files provided")
 
     store = ChunkStore()
-    all_chunks: list = []
 
     with tempfile.TemporaryDirectory() as tmpdir:
-        for upload in pdf_files:
-            path = Path(tmpdir) / upload.filename
-            content = await upload.read()
-            path.write_bytes(content)
-
-            try:
-                pages = extract_text_from_pdf(path)
-            except (ValueError, FileNotFoundError) as e:
-                raise HTTPException(status_code=400, detail=str(e)) from e
-
-            chunks = chunk_text(pages)
-            all_chunks.extend(chunks)
+        paths: list[Path] = []
+        for i, upload in enumerate(pdf_files):
+            # one subdirectory per upload so duplicate filenames can't overwrite each other
+            path = Path(tmpdir) / str(i) / upload.filename
+            path.parent.mkdir()
+            # stream to disk so large uploads never sit fully in memory
+            with path.open("wb") as fh:
+                while chunk := await upload.read(_UPLOAD_CHUNK_SIZE):
+                    fh.write(chunk)
+            paths.append(path)
+
+        # the thread only keeps the event loop free; files overlap in the extraction
+        # process pool when the batch is large. every file finishes before the temp dir
+        # is removed, then the first error is surfaced
+        pages_per_file = await asyncio.to_thread(extract_text_from_pdfs, paths)
+    for result in pages_per_file:
+        if isinstance(result, (ValueError, FileNotFoundError)):
+            raise HTTPException(status_code=400, detail=str(result)) from result
+        if isinstance(result, BaseException):
+            raise result
+
+    all_chunks = [c for pages in pages_per_file for c in chunk_text(pages)]
 
     texts = [c.text for c in all_chunks]
     try:
-        embeddings = embed_texts(texts)
+        embeddings = await embed_texts(texts)
     except ValueError as e:
         raise HTTPException(status_code=500, detail=str(e)) from e
 
-    store.save_chunks(all_chunks, embeddings=embeddings)
-    _load_index()
+    async with _index_lock:
+        store.save_chunks(all_chunks, embeddings=embeddings)
+        # rebuilding (HNSW at scale) can take a while; keep it off the event loop
+        _load_index(await asyncio.to_thread(_build_index))
+        _query_cache.clear()
 
     return {
         "status": "ok",
@@ -136,16 +189,30 @@ async def query(req: QueryRequest):
 
     transformed = transform_query(question)
     try:
-        query_embeddings = embed_texts([transformed])
+        query_embedding = await embed_query(transformed)
     except ValueError as e:
         raise HTTPException(status_code=500, detail=str(e)) from e
 
-    query_embedding = query_embeddings[0]
+    # normalized once here; the cache, search and rerank all take the unit vector
+    query_vec = unit_vector(query_embedding)
+    cached = _query_cache.get(query_vec)
+    if cached is not None:
+        return cached
+
     rrf_results, _ = hybrid_search(
-        query_embedding, transformed, _chunks_cache, _bm25_index, top_k=20
+        query_vec,
+        transformed,
+        _chunks_cache,
+        _emb_matrix,
+        _has_embedding,
+        keyword_index=_bm25_index,
+        top_k=20,
+        ann_index=_ann_index,
     )
 
-    reranked = rerank_by_semantic(rrf_results, query_embedding, _chunks_cache, top_k=5)
+    reranked = rerank_by_semantic(
+        rrf_results, query_vec, _emb_matrix, _has_embedding, top_k=5
+    )
     if not reranked:
         return {
             "answer": "Insufficient evidence. No relevant passages were found in the knowledge base.",
@@ -168,7 +235,9 @@ async def query(req: QueryRequest):
         for c in context_chunks
     ]
 
-    return {"answer": answer, "sources": sources}
+    response = {"answer": answer, "sources": sources}
+    _query_cache.put(query_vec, response)
+    return response
 
 
 @app.get("/health")
@@ -1,4 +1,5 @@
 from .intent import detect_intent, Intent
 from .transform import transform_query
+from .cache import SemanticCache
 
-__all__ = ["detect_intent", "Intent", "transform_query"]
+__all__ = ["detect_intent", "Intent", "transform_query", "SemanticCache"]
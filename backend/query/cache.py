@@ -0,0 +1,49 @@
+import numpy as np
+
+from backend.config import QUERY_CACHE_SIMILARITY, QUERY_CACHE_SIZE
+
+
+class SemanticCache:
+    """
+    bounded LRU of answered queries, keyed by unit-norm query embedding.
+    a lookup hits when a cached query's cosine similarity reaches the threshold,
+    so paraphrased repeats skip retrieval and generation.
+    """
+
+    def __init__(self, capacity: int = QUERY_CACHE_SIZE, threshold: float = QUERY_CACHE_SIMILARITY):
+        self.capacity = capacity
+        self.threshold = threshold
+        self.clear()
+
+    def clear(self) -> None:
+        """drop every entry (e.g. after the corpus changes)."""
+        self._emb: np.ndarray | None = None  # (capacity, D) unit rows, allocated on first put
+        self._values: list[dict | None] = [None] * self.capacity
+        self._last_used = np.zeros(self.capacity, dtype=np.int64)  # 0 marks an empty slot
+        self._clock = 0
+
+    def get(self, query_vec: np.ndarray) -> dict | None:
+        """return the cached value for the closest query, or None below the threshold."""
+        if self._emb is None:
+            return None
+        sims = self._emb @ query_vec
+        sims[self._last_used == 0] = -np.inf
+        slot = int(np.argmax(sims))
+        if sims[slot] < self.threshold:
+            return None
+        self._touch(slot)
+        return self._values[slot]
+
+    def put(self, query_vec: np.ndarray, value: dict) -> None:
+        """insert a value, evicting the least recently used entry when full."""
+        if self._emb is None:
+            self._emb = np.zeros((self.capacity, query_vec.shape[0]), dtype=np.float32)
+        # empty slots have last_used == 0, so they are filled before anything is evicted
+        slot = int(np.argmin(self._last_used))
+        self._emb[slot] = query_vec
+        self._values[slot] = value
+        self._touch(slot)
+
+    def _touch(self, slot: int) -> None:
+        self._clock += 1
+        self._last_used[slot] = self._clock
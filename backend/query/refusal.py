@@ -15,6 +15,9 @@ PII_PATTERNS = [
     (r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b", "email"),
 ]
 
+# compiled once at import; checked in order so the first matching label wins
+_PII_RES = [(re.compile(pattern), label) for pattern, label in PII_PATTERNS]
+
 LEGAL_MEDICAL_KEYWORDS = frozenset({
     "legal advice", "lawsuit", "sue", "attorney", "lawyer",
     "medical advice", "diagnose", "prescription", "doctor said",
@@ -36,8 +39,8 @@ def check_refusal(query: str) -> RefusalResult:
     text = query.strip()
     lower = text.lower()
 
-    for pattern, label in PII_PATTERNS:
-        if re.search(pattern, text):
+    for pattern, label in _PII_RES:
+        if pattern.search(text):
             return RefusalResult(
                 should_refuse=True,
                 reason=RefusalReason.PII,
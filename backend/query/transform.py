@@ -10,6 +10,21 @@ ACRONYM_EXPANSIONS = {
     "llm": "large language model",
 }
 
+_NON_ALNUM_RE = re.compile(r"[^a-zA-Z0-9]")
+
+# clarifying context for definition-style questions, compiled once at import
+_DEF_PATTERNS = [
+    (re.compile(pattern, re.IGNORECASE), repl)
+    for pattern, repl in [
+        (r"what\s+is\s+(.+)\?*$", r"definition explanation of \1"),
+        (r"what\s+are\s+(.+)\?*$", r"definition explanation of \1"),
+        (r"define\s+(.+)$", r"definition of \1"),
+        (r"explain\s+(.+)$", r"explanation of \1"),
+        (r"how\s+does\s+(.+)\s+work\?*$", r"how \1 works mechanism process"),
+        (r"why\s+(.+)\?*$", r"reasons causes for \1"),
+    ]
+]
+
 
 def transform_query(query: str) -> str:
     """
@@ -28,26 +43,17 @@ def transform_query(query: str) -> str:
     words = text.split()
     expanded = []
     for w in words:
-        clean = re.sub(r"[^a-zA-Z0-9]", "", w).lower()
+        clean = _NON_ALNUM_RE.sub("", w).lower()
         if clean in ACRONYM_EXPANSIONS:
             expanded.append(ACRONYM_EXPANSIONS[clean] + " " + w)
         else:
             expanded.append(w)
     text = " ".join(expanded)
 
-    # add clarifying context for definition-style questions
-    def_patterns = [
-        (r"what\s+is\s+(.+)\?*$", r"definition explanation of \1"),
-        (r"what\s+are\s+(.+)\?*$", r"definition explanation of \1"),
-        (r"define\s+(.+)$", r"definition of \1"),
-        (r"explain\s+(.+)$", r"explanation of \1"),
-        (r"how\s+does\s+(.+)\s+work\?*$", r"how \1 works mechanism process"),
-        (r"why\s+(.+)\?*$", r"reasons causes for \1"),
-    ]
-    for pattern, repl in def_patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            text = re.sub(pattern, repl, text, flags=re.IGNORECASE)
+    # add clarifying context for definition-style questions; first pattern that applies wins
+    for pattern, repl in _DEF_PATTERNS:
+        text, n = pattern.subn(repl, text, count=1)
+        if n:
             break
 
     return text.strip()
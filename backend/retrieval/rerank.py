@@ -1,33 +1,29 @@
 import numpy as np
 
+from backend.search.topk import top_k_indices
+
 
 def rerank_by_semantic(
     rrf_results: list[tuple[int, float]],
-    query_embedding: list[float],
-    chunks: list[dict],
+    query_vec: np.ndarray,
+    emb_matrix: np.ndarray,
+    has_embedding: np.ndarray,
     top_k: int = 5,
 ) -> list[tuple[int, float]]:
     """
-    re-rank RRF results by semantic similarity to query.
+    re-rank RRF results by semantic similarity to the unit-norm query vector.
+    emb_matrix holds unit-norm chunk embeddings (see build_embedding_matrix).
     returns list of (chunk_index, semantic_score) sorted by score descending.
     """
-    if not rrf_results or not chunks:
+    if not rrf_results or not len(emb_matrix):
         return []
 
-    query = np.array(query_embedding, dtype=np.float32)
-    query_norm = query / (np.linalg.norm(query) + 1e-10)
-
-    scores = []
-    for idx, _ in rrf_results:
-        if idx >= len(chunks):
-            continue
-        emb = chunks[idx].get("embedding")
-        if emb is None:
-            continue
-        vec = np.array(emb, dtype=np.float32)
-        vec_norm = vec / (np.linalg.norm(vec) + 1e-10)
-        score = float(np.dot(query_norm, vec_norm))
-        scores.append((idx, score))
+    idxs = np.fromiter((idx for idx, _ in rrf_results), dtype=np.int64, count=len(rrf_results))
+    idxs = idxs[idxs < len(emb_matrix)]
+    idxs = idxs[has_embedding[idxs]]
+    if not idxs.size:
+        return []
 
-    scores.sort(key=lambda x: x[1], reverse=True)
-    return scores[:top_k]
+    scores = emb_matrix[idxs] @ query_vec
+    order = top_k_indices(scores, top_k)
+    return list(zip(idxs[order].tolist(), scores[order].tolist()))
@@ -1,5 +1,5 @@
-from .semantic import semantic_search
+from .semantic import build_embedding_matrix, semantic_search, semantic_search_batch
 from .keyword import BM25Index, keyword_search
 from .hybrid import hybrid_search
 
-__all__ = ["semantic_search", "BM25Index", "keyword_search", "hybrid_search"]
+__all__ = ["build_embedding_matrix", "semantic_search", "semantic_search_batch", "BM25Index", "keyword_search", "hybrid_search"]
@@ -1,3 +1,7 @@
+import heapq
+
+import numpy as np
+
 RRF_K = 60
 
 
@@ -20,16 +24,19 @@ def rrf_merge(
     for rank, (idx, _) in enumerate(keyword_results, start=1):
         scores[idx] = scores.get(idx, 0.0) + 1.0 / (k + rank)
 
-    merged = sorted(scores.items(), key=lambda x: x[1], reverse=True)
-    return merged[:top_k]
+    # partial selection; same ordering (ties included) as a full sort truncated to top_k
+    return heapq.nlargest(top_k, scores.items(), key=lambda x: x[1])
 
 
 def hybrid_search(
-    query_embedding: list[float],
+    query_vec: np.ndarray,
     query_text: str,
     chunks: list[dict],
+    emb_matrix: np.ndarray,
+    has_embedding: np.ndarray,
     keyword_index=None,
     top_k: int = 20,
+    ann_index=None,
 ):
     """
     combine semantic and keyword search via RRF.
@@ -38,7 +45,9 @@ def hybrid_search(
     from .semantic import semantic_search
     from .keyword import keyword_search
 
-    semantic_results = semantic_search(query_embedding, chunks, top_k=top_k)
+    semantic_results = semantic_search(
+        query_vec, emb_matrix, has_embedding, top_k=top_k, ann_index=ann_index
+    )
     keyword_results, keyword_index = keyword_search(
         query_text, chunks, index=keyword_index, top_k=top_k
     )
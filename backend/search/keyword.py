@@ -1,42 +1,96 @@
+import hashlib
 import math
+import os
+import pickle
 import re
 from collections import Counter
+from pathlib import Path
+
+import numpy as np
+
+from .topk import top_k_indices
+
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_CACHE_VERSION = 2  # bump when the pickled index layout or tokenizer changes
 
 
 def _tokenize(text: str) -> list[str]:
     """lowercase and tokenize on non-alphanumeric characters."""
-    text = text.lower()
-    tokens = re.findall(r"\b[a-z0-9]+\b", text)
-    return tokens
+    return _TOKEN_RE.findall(text.lower())
+
+
+def corpus_digest(chunks: list[dict]) -> str:
+    """sha1 over chunk texts; identifies the corpus a cached index was built from."""
+    h = hashlib.sha1(str(_CACHE_VERSION).encode())
+    for c in chunks:
+        h.update(c.get("text", "").encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
 
 
 class BM25Index:
-    """bm25 index built from chunk texts."""
+    """bm25 index built from chunk texts, stored as per-term postings."""
 
     def __init__(self, k1: float = 1.5, b: float = 0.75):
         self.k1 = k1
         self.b = b
-        self.doc_tokens: list[list[str]] = []
-        self.doc_len: list[int] = []
+        # term -> (doc ids, term frequencies), both aligned numpy arrays
+        self.postings: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+        self.doc_len: np.ndarray = np.zeros(0, dtype=np.float32)
         self.avgdl: float = 0.0
         self.doc_freq: dict[str, int] = {}
+        self.idf: dict[str, float] = {}
+        # per-doc length normalization, k1 * (1 - b + b * dl / avgdl)
+        self.doc_norm: np.ndarray = np.zeros(0, dtype=np.float32)
         self.N: int = 0
 
     def build(self, chunks: list[dict]) -> None:
         """build index from chunk texts."""
-        self.doc_tokens = [_tokenize(c.get("text", "")) for c in chunks]
-        self.doc_len = [len(t) for t in self.doc_tokens]
+        doc_tokens = [_tokenize(c.get("text", "")) for c in chunks]
         self.N = len(chunks)
-        self.avgdl = sum(self.doc_len) / self.N if self.N else 0
+        self.doc_len = np.fromiter((len(t) for t in doc_tokens), dtype=np.float32, count=self.N)
+        self.avgdl = float(self.doc_len.mean()) if self.N else 0.0
+
+        # inverted index: for each term, the docs containing it and how often
+        postings: dict[str, tuple[list[int], list[int]]] = {}
+        for doc_id, tokens in enumerate(doc_tokens):
+            for term, f in Counter(tokens).items():
+                ids, tfs = postings.setdefault(term, ([], []))
+                ids.append(doc_id)
+                tfs.append(f)
+        self.postings = {
+            term: (np.asarray(ids, dtype=np.int32), np.asarray(tfs, dtype=np.float32))
+            for term, (ids, tfs) in postings.items()
+        }
 
         # document frequency: number of docs containing each term
-        self.doc_freq = {}
-        for tokens in self.doc_tokens:
-            seen = set()
-            for t in tokens:
-                if t not in seen:
-                    seen.add(t)
-                    self.doc_freq[t] = self.doc_freq.get(t, 0) + 1
+        self.doc_freq = {term: len(ids) for term, (ids, _) in self.postings.items()}
+
+        # query-independent parts of the score, computed once here instead of per query
+        self.idf = {term: self._idf(term) for term in self.doc_freq}
+        self.doc_norm = self.k1 * (1 - self.b + self.b * self.doc_len / (self.avgdl + 1e-10))
+
+    def save(self, path: Path, digest: str) -> None:
+        """pickle the built index, prefixed by the corpus digest it belongs to."""
+        # write aside and swap in, so a crash never leaves a truncated cache behind
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "wb") as f:
+            pickle.dump(digest, f, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: Path, digest: str) -> "BM25Index | None":
+        """load a cached index; None if missing, unreadable, or built from another corpus."""
+        try:
+            with open(path, "rb") as f:
+                if pickle.load(f) != digest:
+                    return None
+                index = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            return None
+        return index if isinstance(index, cls) else None
 
     def _idf(self, term: str) -> float:
         """IDF component."""
@@ -45,38 +99,32 @@ class BM25Index:
             return 0.0
         return math.log((self.N - df + 0.5) / (df + 0.5) + 1.0)
 
-    def score(self, query_tokens: list[str], doc_idx: int) -> float:
-        """BM25 score for a single document."""
-        if doc_idx >= len(self.doc_tokens):
-            return 0.0
-        tokens = self.doc_tokens[doc_idx]
-        dl = self.doc_len[doc_idx]
-        tf = Counter(tokens)
-
-        total = 0.0
+    def get_scores(self, query_tokens: list[str]) -> np.ndarray:
+        """BM25 scores for every document, as a float32 array of length N."""
+        scores = np.zeros(self.N, dtype=np.float32)
         for term in set(query_tokens):
-            if term not in tf:
+            posting = self.postings.get(term)
+            if posting is None:
                 continue
-            idf = self._idf(term)
-            f = tf[term]
-            norm = 1 - self.b + self.b * dl / (self.avgdl + 1e-10)
-            total += idf * (f * (self.k1 + 1)) / (f + self.k1 * norm)
-        return total
+            docs, f = posting
+            # doc ids are unique within a posting list, so plain fancy-index add is safe
+            scores[docs] += self.idf[term] * (f * (self.k1 + 1)) / (f + self.doc_norm[docs])
+        return scores
 
     def search(self, query: str, top_k: int = 20) -> list[tuple[int, float]]:
         """
         return top-k documents by bm25 score.
         """
-        if not self.doc_tokens:
+        if not self.N:
             return []
         q_tokens = _tokenize(query)
         if not q_tokens:
             return []
 
-        scores = [(i, self.score(q_tokens, i)) for i in range(self.N)]
-        scores = [(i, s) for i, s in scores if s > 0]
-        scores.sort(key=lambda x: x[1], reverse=True)
-        return scores[:top_k]
+        scores = self.get_scores(q_tokens)
+        hits = np.flatnonzero(scores > 0)
+        order = hits[top_k_indices(scores[hits], top_k)]
+        return list(zip(order.tolist(), scores[order].tolist()))
 
 
 def keyword_search(
@@ -1,34 +1,165 @@
+import os
+from pathlib import Path
+
 import numpy as np
 
+from .topk import top_k_indices
+
+try:
+    import faiss
+except ImportError:  # optional; exact search is used without it
+    faiss = None
+
+# below this many embedded chunks the exact scan is ~ms anyway and has perfect recall
+ANN_MIN_CHUNKS = 50_000
+_HNSW_M = 32
+_HNSW_EF_CONSTRUCTION = 200
+_HNSW_EF_SEARCH = 128
+
 
 def cosine_similarity(a: np.ndarray, b: np.ndarray) -> float:
     """cosine similarity between two vectors."""
-    a_norm = a / (np.linalg.norm(a) + 1e-10)
-    b_norm = b / (np.linalg.norm(b) + 1e-10)
-    return float(np.dot(a_norm, b_norm))
+    # float32 contiguous inputs hit BLAS sdot; one sqrt and no normalized copies
+    a = np.ascontiguousarray(a, dtype=np.float32)
+    b = np.ascontiguousarray(b, dtype=np.float32)
+    denom = np.sqrt(np.vdot(a, a) * np.vdot(b, b)) + 1e-10
+    return float(np.dot(a, b) / denom)
+
+
+def unit_vector(vec: list[float] | np.ndarray) -> np.ndarray:
+    """
+    float32 copy of vec scaled to unit length. normalize a query once and share it.
+    a (q, D) batch is normalized row by row.
+    """
+    v = np.asarray(vec, dtype=np.float32)
+    return v / (np.linalg.norm(v, axis=-1, keepdims=True) + 1e-10)
+
+
+def build_embedding_matrix(
+    embeddings: np.ndarray | None, n_chunks: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    copy stored (already unit-norm) embeddings into one (N, D) float32 matrix.
+    row i belongs to chunk i; chunks past the end of `embeddings` get a zero row.
+    returns (matrix, has_embedding mask).
+    """
+    has_embedding = np.zeros(n_chunks, dtype=bool)
+    if embeddings is None or not len(embeddings):
+        return np.zeros((n_chunks, 0), dtype=np.float32), has_embedding
+
+    n = min(n_chunks, len(embeddings))
+    matrix = np.zeros((n_chunks, embeddings.shape[1]), dtype=np.float32)
+    matrix[:n] = embeddings[:n]
+    has_embedding[:n] = True
+    return matrix, has_embedding
+
+
+def build_ann_index(emb_matrix: np.ndarray, has_embedding: np.ndarray):
+    """
+    faiss HNSW index over the embedded rows (inner product on unit rows == cosine).
+    ANN position j maps to chunk np.flatnonzero(has_embedding)[j].
+    returns None if faiss is not installed or the corpus is below ANN_MIN_CHUNKS.
+    """
+    if faiss is None or int(has_embedding.sum()) < ANN_MIN_CHUNKS:
+        return None
+    vectors = np.ascontiguousarray(emb_matrix[has_embedding], dtype=np.float32)
+    index = faiss.IndexHNSWFlat(vectors.shape[1], _HNSW_M, faiss.METRIC_INNER_PRODUCT)
+    index.hnsw.efConstruction = _HNSW_EF_CONSTRUCTION
+    index.add(vectors)
+    return index
+
+
+def save_ann_index(index, path: Path) -> None:
+    """persist an index from build_ann_index (written aside, then swapped in)."""
+    tmp = path.with_name(path.name + ".tmp")
+    faiss.write_index(index, str(tmp))
+    os.replace(tmp, path)
+
+
+def load_ann_index(path: Path, has_embedding: np.ndarray):
+    """load a persisted ANN index; None if unavailable or it doesn't match the corpus."""
+    if faiss is None or not path.exists():
+        return None
+    try:
+        index = faiss.read_index(str(path))
+    except RuntimeError:
+        return None
+    return index if index.ntotal == int(has_embedding.sum()) else None
 
 
 def semantic_search(
-    query_embedding: list[float],
-    chunks: list[dict],
+    query_vec: np.ndarray,
+    emb_matrix: np.ndarray,
+    has_embedding: np.ndarray,
     top_k: int = 20,
+    ann_index=None,
 ) -> list[tuple[int, float]]:
-    """find top-k chunks by cosine similarity to query embedding."""
-    if not chunks:
+    """
+    find top-k chunks by cosine similarity to the unit-norm query vector (see unit_vector).
+    uses the HNSW index when given (large corpora), otherwise an exact scan.
+    """
+    if not has_embedding.any():
         return []
 
-    query = np.array(query_embedding, dtype=np.float32)
-    query_norm = query / (np.linalg.norm(query) + 1e-10)
-
-    scores = []
-    for i, chunk in enumerate(chunks):
-        emb = chunk.get("embedding")
-        if emb is None:
-            continue
-        vec = np.array(emb, dtype=np.float32)
-        vec_norm = vec / (np.linalg.norm(vec) + 1e-10)
-        score = float(np.dot(query_norm, vec_norm))
-        scores.append((i, score))
-
-    scores.sort(key=lambda x: x[1], reverse=True)
-    return scores[:top_k]
+    if ann_index is not None:
+        return _ann_search(ann_index, query_vec[None, :], has_embedding, top_k)[0]
+
+    # rows are unit-norm, so one matrix-vector product gives every cosine score
+    scores = emb_matrix @ query_vec
+    if has_embedding.all():
+        # usual case: every chunk is embedded, so skip the candidate gather
+        order = top_k_indices(scores, top_k)
+    else:
+        candidates = np.flatnonzero(has_embedding)
+        order = candidates[top_k_indices(scores[candidates], top_k)]
+    return list(zip(order.tolist(), scores[order].tolist()))
+
+
+def semantic_search_batch(
+    query_vecs: np.ndarray,
+    emb_matrix: np.ndarray,
+    has_embedding: np.ndarray,
+    top_k: int = 20,
+    ann_index=None,
+) -> list[list[tuple[int, float]]]:
+    """
+    semantic_search for a (q, D) batch of unit-norm query vectors; one result list per row.
+    the exact path scores every query in a single matrix-matrix product.
+    """
+    n_queries = len(query_vecs)
+    n_candidates = int(has_embedding.sum())
+    if not n_candidates or not n_queries:
+        return [[] for _ in range(n_queries)]
+
+    if ann_index is not None:
+        return _ann_search(ann_index, query_vecs, has_embedding, top_k)
+
+    scores = query_vecs @ emb_matrix.T  # (q, N)
+    if n_candidates < has_embedding.size:
+        candidates = np.flatnonzero(has_embedding)
+        scores = scores[:, candidates]
+    else:
+        candidates = None
+    results = []
+    # per-row selection shares top_k_indices' tie order with semantic_search
+    for row in scores:
+        order = top_k_indices(row, top_k)
+        ids = order if candidates is None else candidates[order]
+        results.append(list(zip(ids.tolist(), row[order].tolist())))
+    return results
+
+
+def _ann_search(
+    index, query_vecs: np.ndarray, has_embedding: np.ndarray, top_k: int
+) -> list[list[tuple[int, float]]]:
+    if top_k <= 0:  # faiss asserts k > 0; match the exact path
+        return [[] for _ in range(len(query_vecs))]
+    index.hnsw.efSearch = max(_HNSW_EF_SEARCH, top_k)
+    scores, positions = index.search(np.ascontiguousarray(query_vecs), top_k)
+    chunk_map = np.flatnonzero(has_embedding)
+    results = []
+    for row_scores, row_positions in zip(scores, positions):
+        found = row_positions >= 0  # faiss pads with -1 when fewer than top_k results exist
+        chunk_ids = chunk_map[row_positions[found]]
+        results.append(list(zip(chunk_ids.tolist(), row_scores[found].tolist())))
+    return results
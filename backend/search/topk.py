@@ -0,0 +1,17 @@
+import numpy as np
+
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    indices of the k largest scores, highest first; equal scores keep index order,
+    matching a stable full sort. O(N) partition + sort of the survivors.
+    """
+    if k <= 0 or not scores.size:
+        return np.empty(0, dtype=np.int64)
+    if k < scores.size:
+        # keep everything tied with the k-th largest so the cutoff picks the lowest indices
+        kth = np.partition(scores, scores.size - k)[scores.size - k]
+        idx = np.flatnonzero(scores >= kth)
+    else:
+        idx = np.arange(scores.size)
+    return idx[np.lexsort((idx, -scores[idx]))[:k]]
@@ -1,37 +1,99 @@
-import json
+import os
+from collections.abc import Iterable
 from pathlib import Path
 
+import numpy as np
+import orjson
+
 from backend.config import DATA_DIR
 from backend.ingestion.chunker import Chunk
 
 
 class ChunkStore:
-    """persist chunks with embeddings to JSON file"""
+    """persist chunk metadata to JSON lines and embeddings to a float16 .npy sidecar"""
 
     def __init__(self, data_dir: Path | None = None):
         self.data_dir = data_dir or DATA_DIR
         self.data_dir.mkdir(parents=True, exist_ok=True)
-        self.chunks_path = self.data_dir / "chunks.json"
+        self.chunks_path = self.data_dir / "chunks.jsonl"
+        self.legacy_chunks_path = self.data_dir / "chunks.json"
+        self.embeddings_path = self.data_dir / "embeddings.npy"
+        self.bm25_path = self.data_dir / "bm25.pkl"
+        self.ann_path = self.data_dir / "hnsw.faiss"
 
     def save_chunks(self, chunks: list[Chunk], embeddings: list[list[float]] | None = None) -> None:
         """persist chunks (and optionally embeddings) to disk"""
-        records = []
-        for i, c in enumerate(chunks):
-            rec = {
+        records = (
+            {
                 "text": c.text,
                 "source_file": c.source_file,
                 "page": c.page,
                 "chunk_index": c.chunk_index,
             }
-            if embeddings and i < len(embeddings):
-                rec["embedding"] = embeddings[i]
-            records.append(rec)
-        with open(self.chunks_path, "w", encoding="utf-8") as f:
-            json.dump(records, f, indent=2, ensure_ascii=False)
+            for c in chunks
+        )
+        self._write(records, embeddings)
 
     def load_chunks(self) -> list[dict]:
-        """load chunks from disk (includes embeddings if present)"""
+        """load chunk metadata from disk (embeddings live in load_embeddings)"""
         if not self.chunks_path.exists():
+            return self._migrate_legacy()
+        with open(self.chunks_path, "rb") as f:
+            return [orjson.loads(line) for line in f if line.strip()]
+
+    def load_embeddings(self) -> np.ndarray | None:
+        """
+        memory-map the (N, D) float16 matrix of unit-norm embeddings; row i belongs to chunk i.
+        returns None if no embeddings were saved.
+        """
+        if not self.embeddings_path.exists():
+            return None
+        return np.load(self.embeddings_path, mmap_mode="r")
+
+    def _migrate_legacy(self) -> list[dict]:
+        """convert an old single-array chunks.json (possibly with inline embeddings) once"""
+        if not self.legacy_chunks_path.exists():
             return []
-        with open(self.chunks_path, encoding="utf-8") as f:
-            return json.load(f)
+        records = orjson.loads(self.legacy_chunks_path.read_bytes())
+
+        embeddings = [rec.pop("embedding") for rec in records if "embedding" in rec]
+        if embeddings or not self.embeddings_path.exists():
+            self._write(records, embeddings)
+        else:
+            self._write_records(records)
+        return records
+
+    def _write(self, records: Iterable[dict], embeddings: list[list[float]] | None) -> None:
+        # embeddings first, each file swapped in whole: an interrupted save leaves at worst
+        # a row count that disagrees with the chunks, which the loader rejects
+        if embeddings:
+            # store unit vectors so cosine similarity is a plain dot product at query time
+            emb = np.asarray(embeddings, dtype=np.float32)
+            emb /= np.linalg.norm(emb, axis=1, keepdims=True) + 1e-10
+            tmp = _tmp_path(self.embeddings_path)
+            with open(tmp, "wb") as f:
+                np.save(f, emb.astype(np.float16))
+            os.replace(tmp, self.embeddings_path)
+        else:
+            self.embeddings_path.unlink(missing_ok=True)
+        self._write_records(records)
+        # corpus changed: drop the cached keyword and ANN indexes
+        self.bm25_path.unlink(missing_ok=True)
+        self.ann_path.unlink(missing_ok=True)
+
+    def _write_records(self, records: Iterable[dict]) -> int:
+        """stream one JSON object per line; returns the number written"""
+        n = 0
+        tmp = _tmp_path(self.chunks_path)
+        with open(tmp, "wb") as f:
+            for rec in records:
+                f.write(orjson.dumps(rec, option=orjson.OPT_APPEND_NEWLINE))
+                n += 1
+        os.replace(tmp, self.chunks_path)
+        self.legacy_chunks_path.unlink(missing_ok=True)
+        return n
+
+
+def _tmp_path(path: Path) -> Path:
+    """sibling temp file to write before os.replace-ing it over path (same filesystem)."""
+    return path.with_name(path.name + ".tmp")